@@ -1,9 +1,13 @@
 """GraphQL client handling, including MondayStream base class."""
 import copy
+import threading
+from functools import cached_property
 from optparse import Option
 
 import backoff
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
 
 from typing import Any, Callable, Optional, Iterable
@@ -11,11 +15,36 @@ from typing import Any, Callable, Optional, Iterable
 from singer_sdk.streams import GraphQLStream
 from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
 
+# A single pooled session shared by every stream, so requests issued from
+# concurrently synced child streams reuse keep-alive connections
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# Serializes Singer message output when child streams sync in parallel
+_message_lock = threading.RLock()
+
+# GraphQL error codes for budgets and limits that reset on their own, so the
+# request is worth retrying. API versions before 2024-01 report an exhausted
+# complexity budget as ComplexityException
+_RETRIABLE_ERROR_CODES = {
+    "ComplexityException",
+    "COMPLEXITY_BUDGET_EXHAUSTED",
+    "RATE_LIMIT_EXCEEDED",
+    "IP_RATE_LIMIT_EXCEEDED",
+    "maxConcurrencyExceeded",
+}
+
 
 class MondayStream(GraphQLStream):
     """Monday stream class."""
 
     url_base = "https://api.monday.com/v2"
+    # The request body is pre-serialized in prepare_request_payload
+    payload_as_json = False
+    # The last (response, body) pair decoded by validate_response
+    _last_response_json: Optional[tuple] = None
 
     @property
     def http_headers(self) -> dict:
@@ -26,6 +55,60 @@ class MondayStream(GraphQLStream):
             headers["User-Agent"] = self.config.get("user_agent")
         return headers
 
+    @cached_property
+    def _query_bytes(self) -> bytes:
+        # The query text never changes for a stream, so serialize it once and
+        # leave the closing brace off for the variables to be appended
+        return orjson.dumps({"query": self.query})[:-1]
+
+    def prepare_request_payload(  # type: ignore[override]
+        self, context: Optional[dict], next_page_token: Optional[Any]
+    ) -> bytes:
+        params = self.get_url_params(context, next_page_token)
+        return self._query_bytes + b',"variables":' + orjson.dumps(params) + b"}"
+
+    @property
+    def requests_session(self) -> requests.Session:
+        return _session
+
+    def _write_schema_message(self) -> None:
+        with _message_lock:
+            super()._write_schema_message()
+
+    def _write_record_message(self, record: dict) -> None:
+        with _message_lock:
+            super()._write_record_message(record)
+
+    def _write_state_message(self) -> None:
+        with _message_lock:
+            super()._write_state_message()
+
+    def validate_response(self, response: requests.Response) -> None:
+        super().validate_response(response)
+        # GraphQL reports failures in the body of a 200 response. This runs
+        # inside the retried request, so budget and rate limit errors back off
+        resp_json = orjson.loads(response.content)
+        errors = resp_json.get("errors")
+        if errors or resp_json.get("data") is None:
+            codes = {resp_json.get("error_code")} | {
+                (error.get("extensions") or {}).get("code") for error in errors or ()
+            }
+            msg = f"GraphQL request failed: {errors or resp_json}"
+            if codes & _RETRIABLE_ERROR_CODES:
+                raise RetriableAPIError(msg, response)
+            raise FatalAPIError(msg)
+        self._last_response_json = (response, resp_json)
+
+    def _response_json(self, response: requests.Response) -> dict:
+        """Return the body of a response that passed validate_response.
+
+        The body is parsed with orjson, which is faster than stdlib json, and
+        only once: validate_response keeps what it decoded for parse_response.
+        """
+        if self._last_response_json is None or self._last_response_json[0] is not response:
+            self.validate_response(response)
+        return self._last_response_json[1]
+
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         resp_json = response.json()
         for row in resp_json["data"]:
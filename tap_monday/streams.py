@@ -1,6 +1,7 @@
 """Stream type classes for tap-monday."""
 
-from typing import Any, Optional, Dict, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Dict, Iterable, List
 
 import requests
 from singer_sdk import typing as th
@@ -9,6 +10,18 @@ from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
 from tap_monday.client import MondayStream
 
 
+def _with_board_id(row: dict, board_id: str) -> dict:
+    """Add the parent board ID to a child record."""
+    row["board_id"] = board_id
+    return row
+
+
+def _compact_query(query: str) -> str:
+    """Collapse a GraphQL query onto one line to keep request bodies small."""
+    lines = (line.strip() for line in query.splitlines())
+    return " ".join(line for line in lines if line)
+
+
 class WorkspacesStream(MondayStream):
     name = "workspaces"
     primary_keys = ["id"]
@@ -19,25 +32,22 @@ class WorkspacesStream(MondayStream):
         th.Property("description", th.StringType, description="The description of the workspace"),
     ).to_dict()
 
-    @property
-    def query(self) -> str:
-        return """
-            query {
-                workspaces {
-                    id
-                    name
-                    description
-                }
+    query = _compact_query("""
+        query {
+            workspaces {
+                id
+                name
+                description
             }
-        """
+        }
+    """)
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         # Log the raw response JSON for debugging
-        resp_json = response.json()
+        resp_json = self._response_json(response)
         
-        # Process the response and yield each workspace
-        for workspace in resp_json.get("data", {}).get("workspaces", []):
-            yield workspace
+        # Return the workspaces as parsed
+        return resp_json["data"].get("workspaces") or []
 
     def get_next_page_token(
         self, response: requests.Response, previous_token: Optional[Any]
@@ -86,51 +96,70 @@ class BoardsStream(MondayStream):
         ))),  # Updated to match the new structure
     ).to_dict()
 
-    @property
-    def query(self) -> str:
-        return """
-            query ($page: Int!, $board_limit: Int!) {
-                boards(limit: $board_limit, page: $page) {
-                    id
-                    name
-                    description
-                    state
-                    board_kind
-                    permissions
-                    creator {
+    # Items are owned by ItemsStream; only embed them in boards when asked to
+    _items_page_fields = """
+        items_page(limit: 25, query_params: {order_by:{column_id:"__last_updated__",direction:desc}}) {
+            items {
+                id
+                name
+                created_at
+                creator_id
+                email
+                relative_link
+                state
+                updated_at
+                url
+                column_values {
+                    column {
                         id
-                        name
+                        title
                     }
-                    updated_at
-                    workspace_id
-                    items_page(limit: 25, query_params: {order_by:{column_id:"__last_updated__",direction:desc}}) {
-                        items {
-                            id
-                            name
-                            created_at
-                            creator_id
-                            email
-                            relative_link
-                            state
-                            updated_at
-                            url
-                            column_values {
-                                column {
-                                    id
-                                    title
-                                }
-                                id
-                                type
-                                ... on BoardRelationValue {
-                                    linked_item_ids
-                                }
-                                value
-                            }
-                        }
+                    id
+                    type
+                    ... on BoardRelationValue {
+                        linked_item_ids
                     }
+                    value
                 }
             }
-        """
+        }
+    """
+
+    _query_template = """
+        query ($page: Int!, $board_limit: Int!) {
+            boards(limit: $board_limit, page: $page) {
+                id
+                name
+                description
+                state
+                board_kind
+                permissions
+                creator {
+                    id
+                    name
+                }
+                updated_at
+                workspace_id
+                %s
+            }
+        }
+    """
+
+    _query = _compact_query(_query_template % "")
+    _query_with_items = _compact_query(_query_template % _items_page_fields)
+
+    @property
+    def query(self) -> str:
+        if self.config.get("include_items_on_board", False):
+            return self._query_with_items
+        return self._query
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._board_limit = int(self.config.get("board_limit", 10))
+        self._batch_size = int(self.config.get("batch_size", 25))
+        self._pending_board_ids: List[str] = []
+        self._last_page_count = 0
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
@@ -138,33 +167,93 @@ class BoardsStream(MondayStream):
         # Ensure page and board_limit are integers
         return {
             "page": int(next_page_token or 1),
-            "board_limit": int(self.config.get("board_limit", 10)),
+            "board_limit": self._board_limit,
         }
 
-    def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
-        return {
-            "board_id": record["id"],
-        }
+    def generate_child_contexts(
+        self, record: dict, context: Optional[dict]
+    ) -> Iterable[Optional[dict]]:
+        # Queue board IDs so child streams can query several boards per request
+        if not self.stream_maps[0].get_filter_result(record):
+            return
+        self._pending_board_ids.append(record["id"])
+        if len(self._pending_board_ids) >= self._batch_size:
+            yield self._flush_child_context()
+
+    def _flush_child_context(self) -> dict:
+        board_ids, self._pending_board_ids = self._pending_board_ids, []
+        return {"board_ids": board_ids}
+
+    def _sync_children(self, child_context: Optional[dict]) -> None:
+        if child_context is None:
+            super()._sync_children(child_context)
+            return
+        # Child streams hit the API independently, so sync them side by side
+        children = [
+            child_stream for child_stream in self.child_streams
+            if child_stream.selected or child_stream.has_selected_descendents
+        ]
+        if not children:
+            return
+        # Workers share tap_state, and the message lock in MondayStream only
+        # covers writing it out while a sibling may be changing it. These
+        # children are FULL_TABLE with state_partitioning_keys = [] and no
+        # children of their own, so the only state a worker writes is the
+        # starting replication marker from Stream.sync. Anything else (e.g.
+        # a child with a replication key) is synced one at a time.
+        if any(
+            child_stream.replication_key
+            or child_stream.state_partitioning_keys != []
+            or child_stream.child_streams
+            for child_stream in children
+        ):
+            super()._sync_children(child_context)
+            return
+        for child_stream in children:
+            # Create each state entry and its starting marker before any worker
+            # starts. A key added while a sibling deep-copies tap_state would
+            # break the copy; the worker then only rewrites the same value
+            child_stream._write_starting_replication_value(child_context)
+        max_workers = max(1, min(len(children), int(self.config.get("max_concurrency", 4))))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(child_stream.sync, context=dict(child_context))
+                for child_stream in children
+            ]
+            for future in futures:
+                future.result()
+
+    def get_records(self, context: Optional[dict]) -> Iterable[Dict[str, Any]]:
+        yield from super().get_records(context)
+        # Sync children for the final, partially filled batch of boards
+        if self._pending_board_ids:
+            self._sync_children(self._flush_child_context())
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         # Log the raw response JSON for debugging
-        resp_json = response.json()
+        resp_json = self._response_json(response)
+        boards = resp_json["data"].get("boards") or ()
+        # Remember the page size so get_next_page_token needn't reparse
+        self._last_page_count = len(boards)
 
         # Process the response as usual
-        for board in resp_json.get("data", {}).get("boards", []):
+        for board in boards:
             # Flatten the items_page structure into the board record
-            board["items"] = board.get("items_page", {}).get("items", [])
+            items_page = board.pop("items_page", None)
+            if items_page is not None:
+                board["items"] = items_page.get("items") or []
             yield board
 
-    def post_process(self, row: dict, context: Optional[dict] = None) -> dict:
-        return row
-
     def get_next_page_token(
         self, response: requests.Response, previous_token: Optional[Any]
     ) -> Any:
         current_page = previous_token if previous_token is not None else 1
-        if len(response.json()["data"]["boards"]) == self.config.get("board_limit", 10):
+        if self._last_page_count == self._board_limit:
             return current_page + 1
+        self.logger.debug(
+            f"Page {current_page} returned {self._last_page_count} of "
+            f"{self._board_limit} boards, stopping pagination"
+        )
         return None
 
     def validate_response(self, response: requests.Response) -> None:
@@ -198,6 +287,8 @@ class BoardViewsStream(MondayStream):
     replication_key = None
     parent_stream_type = BoardsStream
     ignore_parent_replication_keys = True
+    # Contexts carry a batch of board IDs; don't keep state per batch
+    state_partitioning_keys: List[str] = []
     schema = th.PropertiesList(
         th.Property("id", th.StringType),
         th.Property("name", th.StringType),
@@ -207,46 +298,39 @@ class BoardViewsStream(MondayStream):
         th.Property("board_id", th.StringType),
     ).to_dict()
 
-    @property
-    def query(self) -> str:
-        return """
-            query ($board_id: [ID!]!) {
-                boards(ids: $board_id) {
-                    id 
-                    views {
-                        id
-                        name
-                        type
-                        settings_str
-                        view_specific_data_str
-                    }
+    query = _compact_query("""
+        query ($board_id: [ID!]!) {
+            boards(ids: $board_id) {
+                id 
+                views {
+                    id
+                    name
+                    type
+                    settings_str
+                    view_specific_data_str
                 }
             }
-        """
+        }
+    """)
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         # Ensure board_id is passed as a list of strings
         return {
-            "board_id": [str(context["board_id"])]
+            "board_id": [str(board_id) for board_id in context["board_ids"]]
         }
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         # Log the raw response JSON for debugging
-        resp_json = response.json()
+        resp_json = self._response_json(response)
         
-        # Process the response as usual
-        for board in resp_json.get("data", {}).get("boards", []):
-            board_id = board.get("id")  # Safely retrieve the board ID
-            for view in board.get("views", []):
-                view["board_id"] = board_id  # Add the parent board ID to the view
-                yield view
-
-    def post_process(self, row: dict, context: Optional[dict] = None) -> dict:
-        # Normalize fields if needed
-        row["board_id"] = context["board_id"]
-        return row
+        # Tag each view with its parent board ID
+        return [
+            _with_board_id(view, board["id"])
+            for board in resp_json["data"].get("boards") or ()
+            for view in board.get("views") or ()
+        ]
 
     def get_next_page_token(
         self, response: requests.Response, previous_token: Optional[Any]
@@ -261,6 +345,8 @@ class GroupsStream(MondayStream):
     replication_key = None
     parent_stream_type = BoardsStream
     ignore_parent_replication_keys = True
+    # Contexts carry a batch of board IDs; don't keep state per batch
+    state_partitioning_keys: List[str] = []
     schema = th.PropertiesList(
         th.Property("id", th.StringType, description="The unique ID of the group"),
         th.Property("title", th.StringType, description="The title of the group"),
@@ -270,46 +356,44 @@ class GroupsStream(MondayStream):
         th.Property("board_id", th.StringType, description="The ID of the parent board"),
     ).to_dict()
 
-    @property
-    def query(self) -> str:
-        return """
-            query ($board_id: [ID!]!) {
-                boards(ids: $board_id) {
+    query = _compact_query("""
+        query ($board_id: [ID!]!) {
+            boards(ids: $board_id) {
+                id
+                groups {
                     id
-                    groups {
-                        id
-                        title
-                        position
-                        color
-                        archived
-                    }
+                    title
+                    position
+                    color
+                    archived
                 }
             }
-        """
+        }
+    """)
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         # Ensure board_id is passed as a list of strings
         return {
-            "board_id": [str(context["board_id"])]
+            "board_id": [str(board_id) for board_id in context["board_ids"]]
         }
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         # Log the raw response JSON for debugging
-        resp_json = response.json()
+        resp_json = self._response_json(response)
 
-        # Process the response and yield each group
-        for board in resp_json.get("data", {}).get("boards", []):
-            board_id = board.get("id")  # Safely retrieve the board ID
-            for group in board.get("groups", []):
-                group["board_id"] = board_id  # Add the parent board ID to the group
-                yield group
+        # Tag each group with its parent board ID
+        return [
+            _with_board_id(group, board["id"])
+            for board in resp_json["data"].get("boards") or ()
+            for group in board.get("groups") or ()
+        ]
 
     def post_process(self, row: dict, context: Optional[dict] = None) -> dict:
         # Normalize fields if needed
-        row["board_id"] = context["board_id"]
-        row["position"] = float(row["position"]) if "position" in row else None  # Ensure position is a float
+        pos = row.get("position")
+        row["position"] = float(pos) if pos is not None else None  # Ensure position is a float
         return row
 
     def get_next_page_token(
@@ -325,6 +409,8 @@ class ColumnsStream(MondayStream):
     replication_key = None
     parent_stream_type = BoardsStream
     ignore_parent_replication_keys = True
+    # Contexts carry a batch of board IDs; don't keep state per batch
+    state_partitioning_keys: List[str] = []
     schema = th.PropertiesList(
         th.Property("id", th.StringType, description="The unique ID of the column"),
         th.Property("title", th.StringType, description="The title of the column"),
@@ -335,51 +421,46 @@ class ColumnsStream(MondayStream):
         th.Property("board_id", th.StringType, description="The ID of the parent board"),
     ).to_dict()
 
-    @property
-    def query(self) -> str:
-        return """
-            query ($board_id: [ID!]!) {
-                boards(ids: $board_id) {
+    query = _compact_query("""
+        query ($board_id: [ID!]!) {
+            boards(ids: $board_id) {
+                id
+                columns {
                     id
-                    columns {
-                        id
-                        title
-                        type
-                        settings_str
-                        archived
-                        width
-                    }
+                    title
+                    type
+                    settings_str
+                    archived
+                    width
                 }
             }
-        """
+        }
+    """)
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         # Ensure board_id is passed as a list of strings
         return {
-            "board_id": [str(context["board_id"])]
+            "board_id": [str(board_id) for board_id in context["board_ids"]]
         }
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         # Log the raw response JSON for debugging
-        resp_json = response.json()
+        resp_json = self._response_json(response)
 
-        # Process the response and yield each column
-        for board in resp_json.get("data", {}).get("boards", []):
-            board_id = board.get("id")  # Safely retrieve the board ID
-            for column in board.get("columns", []):
-                column["board_id"] = board_id  # Add the parent board ID to the column
-                yield column
+        # Tag each column with its parent board ID
+        return [
+            _with_board_id(column, board["id"])
+            for board in resp_json["data"].get("boards") or ()
+            for column in board.get("columns") or ()
+        ]
 
     def post_process(self, row: dict, context: Optional[dict] = None) -> dict:
         # Normalize fields if needed
-        row["board_id"] = context["board_id"]
         # Ensure width is cast to a string
-        if row.get("width") is None: 
-            row["width"] = "0"
-        else:
-            row["width"] = str(row["width"])
+        w = row.get("width")
+        row["width"] = "0" if w is None else (w if type(w) is str else str(w))
         return row
 
     def get_next_page_token(
@@ -391,10 +472,17 @@ class ColumnsStream(MondayStream):
 
 class ItemsStream(MondayStream):
     name = "items"
+    items_page_limit = 100  # Fetch 100 items per page
     primary_keys = ["id", "board_id"]  # Composite primary key
     replication_key = None
     parent_stream_type = BoardsStream
     ignore_parent_replication_keys = True
+    # Contexts carry a batch of board IDs; don't keep state per batch
+    state_partitioning_keys: List[str] = []
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pending_cursors: List[List[str]] = []
     schema = th.PropertiesList(
         th.Property("id", th.StringType, description="The unique ID of the item"),
         th.Property("name", th.StringType, description="The name of the item"),
@@ -422,74 +510,87 @@ class ItemsStream(MondayStream):
         ))),
     ).to_dict()
 
-    @property
-    def query(self) -> str:
-        return """
-            query ($board_id: [ID!]!, $cursor: String, $limit: Int!) {
-                boards(ids: $board_id) {
-                    id
-                    items_page(cursor: $cursor, limit: $limit) {
-                        cursor
-                        items {
+    query = _compact_query("""
+        query ($board_id: [ID!]!, $cursor: String, $limit: Int!) {
+            boards(ids: $board_id) {
+                id
+                items_page(cursor: $cursor, limit: $limit) {
+                    cursor
+                    items {
+                        id
+                        name
+                        group {
                             id
-                            name
-                            created_at
-                            creator_id
-                            email
-                            relative_link
-                            state
-                            updated_at
-                            url
-                            column_values {
-                                column {
-                                    id
-                                    title
-                                }
+                        }
+                        created_at
+                        creator_id
+                        email
+                        relative_link
+                        state
+                        updated_at
+                        url
+                        column_values {
+                            column {
                                 id
-                                type
-                                ... on BoardRelationValue {
-                                    linked_item_ids
-                                }
-                                value
+                                title
+                            }
+                            id
+                            type
+                            ... on BoardRelationValue {
+                                linked_item_ids
                             }
+                            value
                         }
                     }
                 }
             }
-        """
+        }
+    """)
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
-        # Pass the board_id, cursor, and limit for pagination
+        # The first page covers the whole batch of boards; later pages follow
+        # one board's cursor at a time
+        if next_page_token:
+            board_id, cursor = next_page_token[0]
+            board_ids = [board_id]
+        else:
+            board_ids, cursor = context["board_ids"], None
         return {
-            "board_id": [str(context["board_id"])],
-            "cursor": next_page_token,  # Use the cursor for pagination
-            "limit": 100,  # Fetch 100 items per page
+            "board_id": [str(board_id) for board_id in board_ids],
+            "cursor": cursor,  # Use the cursor for pagination
+            "limit": self.items_page_limit,
         }
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
-        # Log the raw response JSON for debugging
-        resp_json = response.json()
-        
-        # Process the response and yield each item
-        for board in resp_json.get("data", {}).get("boards", []):
-            board_id = board.get("id")
-            items_data = board.get("items_page", {})
-            for item in items_data.get("items", []):
+        boards = self._response_json(response)["data"].get("boards") or ()
+        # Remember which boards have more items so get_next_page_token
+        # needn't reparse
+        self._pending_cursors = [
+            [board["id"], board["items_page"]["cursor"]]
+            for board in boards
+            if (board.get("items_page") or {}).get("cursor")
+        ]
+        for board in boards:
+            board_id = board["id"]
+            items_data = board.get("items_page") or {}
+            for item in items_data.get("items") or ():
                 item["board_id"] = board_id  # Add the parent board ID to the item
-                item["group_id"] = item.get("group", {}).get("id")  # Extract group ID
-                item["creator_id"] = item.get("creator", {}).get("id")  # Extract creator ID
+                group = item.pop("group", None)
+                item["group_id"] = group["id"] if group else None  # Extract group ID
                 yield item
 
     def get_next_page_token(
         self, response: requests.Response, previous_token: Optional[Any]
-    ) -> Optional[str]:
-        # Extract the next cursor for pagination
-        resp_json = response.json()
-        for board in resp_json.get("data", {}).get("boards", []):
-            return board.get("items_page", {}).get("cursor")  # Return the cursor for the next page
-        return None  # No more pages
+    ) -> Optional[List[List[str]]]:
+        # Queue a (board_id, cursor) pair for every board with more items.
+        # New cursors join the back so the boards take turns: a cursor never
+        # waits for another board to finish paginating, and Monday expires
+        # cursors after 60 minutes
+        pending = list(previous_token[1:]) if previous_token else []
+        pending.extend(self._pending_cursors)
+        return pending or None  # No more pages
 
 
 class UsersStream(MondayStream):
@@ -511,34 +612,31 @@ class UsersStream(MondayStream):
         th.Property("created_at", th.DateTimeType, description="The date the user was created"),
     ).to_dict()
 
-    @property
-    def query(self) -> str:
-        return """
-            query {
-                users {
+    query = _compact_query("""
+        query {
+            users {
+                id
+                name
+                email
+                enabled
+                is_admin
+                is_guest
+                url
+                teams {
                     id
                     name
-                    email
-                    enabled
-                    is_admin
-                    is_guest
-                    url
-                    teams {
-                        id
-                        name
-                    }
-                    created_at
                 }
+                created_at
             }
-        """
+        }
+    """)
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         # Log the raw response JSON for debugging
-        resp_json = response.json()
+        resp_json = self._response_json(response)
        
-        # Process the response and yield each user
-        for user in resp_json.get("data", {}).get("users", []):
-            yield user
+        # Return the users as parsed
+        return resp_json["data"].get("users") or []
 
     def get_next_page_token(
         self, response: requests.Response, previous_token: Optional[Any]
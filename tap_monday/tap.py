@@ -1,7 +1,9 @@
 """Monday tap class."""
 
-from typing import List
+import decimal
+from typing import Any, List
 
+import orjson
 from singer_sdk import Tap, Stream
 from singer_sdk import typing as th
 
@@ -16,6 +18,15 @@ from tap_monday.streams import (
     ItemsStream,
 )
 
+
+def _default_encoding(obj: Any) -> Any:
+    """Encode values orjson doesn't handle natively, as the SDK does."""
+    if isinstance(obj, decimal.Decimal):
+        # orjson can't write a Decimal exactly; let the SDK encoder do it
+        raise TypeError
+    return str(obj)
+
+
 STREAM_TYPES = [
     WorkspacesStream,
     BoardsStream,
@@ -44,8 +55,37 @@ class TapMonday(Tap):
             default=10,
             description="The number of boards to fetch at once"
         ),
+        th.Property(
+            "include_items_on_board",
+            th.BooleanType,
+            default=False,
+            description="Whether to embed each board's 25 latest items in board records"
+        ),
+        th.Property(
+            "batch_size",
+            th.IntegerType,
+            default=25,
+            description="The number of boards to query per child stream request"
+        ),
+        th.Property(
+            "max_concurrency",
+            th.IntegerType,
+            default=4,
+            description="The maximum number of child streams to sync in parallel"
+        ),
     ).to_dict()
 
+    def serialize_message(self, message: Any) -> str:
+        """Serialize a Singer message with orjson instead of simplejson.
+
+        Messages orjson can't encode exactly (Decimals, integers wider than
+        64 bits) fall back to the SDK's simplejson encoder.
+        """
+        try:
+            return orjson.dumps(message.to_dict(), default=_default_encoding).decode()
+        except TypeError:
+            return super().serialize_message(message)
+
     def discover_streams(self) -> List[Stream]:
         """Return a list of discovered streams."""
         return [stream_class(tap=self) for stream_class in STREAM_TYPES]
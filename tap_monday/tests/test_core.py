@@ -1,7 +1,11 @@
 """Tests standard tap features using the built-in SDK tests library."""
 
 import datetime
+import decimal
 
+import pytest
+from singer_sdk._singerlib import RecordMessage
+from singer_sdk._singerlib.encoding import SimpleSingerWriter
 from singer_sdk.testing import get_standard_tap_tests
 
 from tap_monday.tap import TapMonday
@@ -23,4 +27,19 @@ def test_standard_tap_tests():
         test()
 
 
+@pytest.mark.parametrize("value", [
+    "text",
+    1.5,
+    None,
+    2 ** 70,
+    decimal.Decimal("12345678901234567.123456789"),
+    datetime.date(2024, 1, 2),
+])
+def test_serialize_message_matches_sdk_encoder(value):
+    """orjson output matches the SDK's simplejson encoder, falling back to it."""
+    tap = TapMonday(config={"auth_token": "token"}, parse_env_config=False)
+    message = RecordMessage(stream="items", record={"value": value})
+    assert tap.serialize_message(message) == SimpleSingerWriter().serialize_message(message)
+
+
 # TODO: Create additional tests as appropriate for your tap.
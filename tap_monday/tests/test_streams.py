@@ -0,0 +1,220 @@
+"""Tests for board batching and items pagination against a fake Monday API."""
+
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+import requests
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
+
+from tap_monday import client
+from tap_monday.streams import ItemsStream
+from tap_monday.tap import TapMonday
+
+ITEMS_PAGE_LIMIT = 2
+BUDGET_EXHAUSTED = {
+    "errors": [{
+        "message": "Complexity budget exhausted",
+        "extensions": {"code": "COMPLEXITY_BUDGET_EXHAUSTED", "retry_in_seconds": 1},
+    }],
+}
+
+
+def _items_for(board_id: str) -> list:
+    # Boards hold between one and six items so some need several pages
+    return [f"{board_id}-{n}" for n in range(int(board_id) % 6 + 1)]
+
+
+class FakeMondayAPI:
+    """Answer the tap's GraphQL queries for a fixed number of boards."""
+
+    def __init__(self, board_count: int, budget_errors: int = 0):
+        self.board_ids = [str(i) for i in range(board_count)]
+        self.budget_errors = budget_errors
+        self.calls = []
+
+    def _items_page(self, board_id: str, offset: int) -> dict:
+        items = _items_for(board_id)
+        end = offset + ITEMS_PAGE_LIMIT
+        return {
+            "cursor": f"{board_id}:{end}" if end < len(items) else None,
+            "items": [
+                {"id": item_id, "updated_at": "2024-01-01T00:00:00Z"}
+                for item_id in items[offset:end]
+            ],
+        }
+
+    def send(self, prepared_request, **kwargs):
+        body = json.loads(prepared_request.body)
+        query, variables = body["query"], body["variables"]
+        self.calls.append((query, variables))
+        if query.startswith("query { workspaces"):
+            data = {"workspaces": [{"id": "1"}]}
+        elif query.startswith("query { users"):
+            data = {"users": [{"id": "1"}]}
+        elif "$page" in query:
+            start = (variables["page"] - 1) * variables["board_limit"]
+            page = self.board_ids[start:start + variables["board_limit"]]
+            data = {"boards": [{"id": board_id} for board_id in page]}
+        elif "items_page" in query and self.budget_errors:
+            self.budget_errors -= 1
+            return self._response(prepared_request, BUDGET_EXHAUSTED)
+        elif "items_page" in query:
+            cursor = variables["cursor"]
+            if cursor:
+                # Cursors are board specific, so they must be followed one by one
+                assert len(variables["board_id"]) == 1
+                board_id, offset = cursor.split(":")
+                assert board_id == variables["board_id"][0]
+                boards = [{"id": board_id, "items_page": self._items_page(board_id, int(offset))}]
+            else:
+                boards = [
+                    {"id": board_id, "items_page": self._items_page(board_id, 0)}
+                    for board_id in variables["board_id"]
+                ]
+            data = {"boards": boards}
+        else:
+            key = next(k for k in ("views", "groups", "columns") if f" {k} {{" in query)
+            data = {
+                "boards": [
+                    {"id": board_id, key: [{"id": f"{key}-{board_id}", "position": "1"}]}
+                    for board_id in variables["board_id"]
+                ]
+            }
+        return self._response(prepared_request, {"data": data})
+
+    @staticmethod
+    def _response(prepared_request, body: dict) -> requests.Response:
+        response = requests.Response()
+        response._content = json.dumps(body).encode()
+        response.status_code = 200
+        response.request = prepared_request
+        response.url = prepared_request.url
+        return response
+
+    def child_calls(self, field: str) -> list:
+        return [
+            variables for query, variables in self.calls
+            if "boards(ids:" in query and f" {field} {{" in query
+        ]
+
+
+def _sync(board_count: int, batch_size: int, capsys, budget_errors: int = 0) -> tuple:
+    api = FakeMondayAPI(board_count, budget_errors)
+    config = {"auth_token": "token", "batch_size": batch_size, "board_limit": 4}
+    with mock.patch.object(client._session, "send", api.send), \
+            mock.patch.object(ItemsStream, "items_page_limit", ITEMS_PAGE_LIMIT):
+        TapMonday(config=config, parse_env_config=False).sync_all()
+    records = {}
+    for line in capsys.readouterr().out.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            records.setdefault(message["stream"], []).append(message["record"])
+    return api, records
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 25])
+@pytest.mark.parametrize("board_count", [0, 1, 6, 7])
+def test_child_streams_cover_every_board_once(board_count, batch_size, capsys):
+    api, records = _sync(board_count, batch_size, capsys)
+    board_ids = api.board_ids
+
+    assert [r["id"] for r in records.get("boards", [])] == board_ids
+    for stream, field in (("board_views", "views"), ("groups", "groups"), ("columns", "columns")):
+        assert sorted(r["board_id"] for r in records.get(stream, [])) == sorted(board_ids)
+        calls = api.child_calls(field)
+        assert len(calls) == math.ceil(board_count / batch_size)
+        assert all(len(call["board_id"]) <= batch_size for call in calls)
+
+    items = [(r["board_id"], r["id"]) for r in records.get("items", [])]
+    expected = [(b, item_id) for b in board_ids for item_id in _items_for(b)]
+    assert len(items) == len(set(items))
+    assert sorted(items) == sorted(expected)
+
+
+def test_items_first_page_is_batched_then_cursors_are_per_board(capsys):
+    api, _ = _sync(4, 25, capsys)
+    calls = [
+        (variables["board_id"], variables["cursor"])
+        for variables in api.child_calls("items")
+    ]
+
+    # Boards 2 and 3 hold more than one page of items
+    assert calls == [
+        (["0", "1", "2", "3"], None),
+        (["2"], "2:2"),
+        (["3"], "3:2"),
+    ]
+
+
+def test_items_cursors_are_followed_round_robin(capsys):
+    api, _ = _sync(6, 25, capsys)
+    calls = [
+        (variables["board_id"], variables["cursor"])
+        for variables in api.child_calls("items")
+    ]
+
+    # Boards 4 and 5 need three pages; neither waits for the other to finish
+    assert calls == [
+        (["0", "1", "2", "3", "4", "5"], None),
+        (["2"], "2:2"),
+        (["3"], "3:2"),
+        (["4"], "4:2"),
+        (["5"], "5:2"),
+        (["4"], "4:4"),
+        (["5"], "5:4"),
+    ]
+
+
+@pytest.mark.parametrize("stream_name", ["boards", "groups", "items"])
+@pytest.mark.parametrize("body, error", [
+    (BUDGET_EXHAUSTED, RetriableAPIError),
+    ({"error_code": "ComplexityException", "error_message": "Complexity budget exhausted"}, RetriableAPIError),
+    ({"errors": [{"message": "Rate limit exceeded", "extensions": {"code": "RATE_LIMIT_EXCEEDED"}}]}, RetriableAPIError),
+    ({"errors": [{"message": "Field 'nope' doesn't exist", "extensions": {"code": "undefinedField"}}]}, FatalAPIError),
+    ({"data": {"boards": [{"id": "1"}]}, "errors": [{"message": "Internal server error"}]}, FatalAPIError),
+    ({"account_id": 1}, FatalAPIError),
+])
+def test_graphql_error_body_is_retried_or_fatal_by_code(stream_name, body, error):
+    stream = TapMonday(config={"auth_token": "token"}, parse_env_config=False).streams[stream_name]
+    response = requests.Response()
+    response._content = json.dumps(body).encode()
+    response.status_code = 200
+
+    with pytest.raises(error) as excinfo:
+        stream.validate_response(response)
+    assert type(excinfo.value) is error
+
+
+def test_exhausted_complexity_budget_is_retried(capsys):
+    with mock.patch("backoff._sync.time.sleep"):
+        api, records = _sync(2, 25, capsys, budget_errors=2)
+
+    assert api.budget_errors == 0
+    assert sorted(r["id"] for r in records["items"]) == ["0-0", "1-0", "1-1"]
+
+
+def test_incremental_child_streams_are_not_synced_concurrently(capsys):
+    with mock.patch.object(ItemsStream, "replication_key", "updated_at"), \
+            mock.patch("tap_monday.streams.ThreadPoolExecutor") as executor:
+        api, records = _sync(3, 25, capsys)
+
+    executor.assert_not_called()
+    assert len(records["groups"]) == 3
+
+
+def test_child_state_is_seeded_before_workers_start(capsys):
+    submit = ThreadPoolExecutor.submit
+    seeded = []
+
+    def record_state(executor, fn, *args, **kwargs):
+        seeded.append("starting_replication_value" in fn.__self__.stream_state)
+        return submit(executor, fn, *args, **kwargs)
+
+    with mock.patch.object(ThreadPoolExecutor, "submit", record_state):
+        _sync(3, 1, capsys)
+
+    # Three batches of one board, each with four children
+    assert seeded == [True] * 12